@@ -12,6 +12,12 @@ class GroupAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "tournament", "join_code")
     search_fields = ("name", "join_code")
     list_filter = ("tournament",)
+    list_select_related = ("tournament",)
+
+    def get_queryset(self, request):
+        # Vom Turnier nur den Namen laden (relegated_teams etc. nicht mitschleppen)
+        qs = super().get_queryset(request)
+        return qs.only("id", "name", "join_code", "owner", "tournament__id", "tournament__name")
 
 
 @admin.register(Match)
@@ -19,18 +25,35 @@ class MatchAdmin(admin.ModelAdmin):
     list_display = ("id", "tournament", "home_team", "away_team", "kickoff", "home_score", "away_score")
     list_filter = ("tournament",)
     search_fields = ("home_team", "away_team")
+    list_select_related = ("tournament",)
+
+    def get_queryset(self, request):
+        # Nur die breiten Turnier-Spalten weglassen. Match-Felder NICHT per only() einschränken:
+        # save() schreibt bei deferred fields nur die geladenen Spalten → auto_now (updated_at)
+        # käme nie in der DB an und die Tabellen-/Statistik-Caches blieben veraltet.
+        qs = super().get_queryset(request)
+        return qs.select_related("tournament").defer(
+            "tournament__season_start",
+            "tournament__autumn_champion",
+            "tournament__champion",
+            "tournament__first_coach_sacked",
+            "tournament__top_scorer",
+            "tournament__relegated_teams",
+        )
 
 
 @admin.register(GroupMembership)
 class GroupMembershipAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "group")
     list_filter = ("group",)
+    list_select_related = ("user", "group", "group__tournament")
 
 
 @admin.register(Prediction)
 class PredictionAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "group", "match", "pred_home", "pred_away", "updated_at")
     list_filter = ("group",)
+    list_select_related = ("user", "group", "group__tournament", "match")
 
 
 @admin.register(BonusPrediction)
@@ -8,10 +8,21 @@ def active_group_context(request):
             "my_groups": [],
         }
 
-    memberships = (
+    # Pro Request nur einmal berechnen (auch bei mehreren Renders/Includes)
+    cached = getattr(request, "_active_group_ctx", None)
+    if cached is not None:
+        return cached
+
+    # Einmal laden, danach nur noch in Python filtern
+    memberships = list(
         GroupMembership.objects
         .filter(user=request.user)
         .select_related("group__tournament")
+        .only(
+            "id", "user", "group", "is_creator",
+            "group__id", "group__name", "group__join_code",
+            "group__tournament__id", "group__tournament__name",
+        )
         .order_by("group__name")
     )
 
@@ -22,17 +33,18 @@ def active_group_context(request):
 
     membership = None
     if active_group_id:
-        membership = memberships.filter(group_id=active_group_id).first()
+        membership = next((m for m in memberships if m.group_id == active_group_id), None)
 
     # Fallback: erste Gruppe setzen
-    if membership is None and memberships.exists():
-        membership = memberships.first()
+    if membership is None and memberships:
+        membership = memberships[0]
         request.session["active_group_id"] = membership.group_id
 
     group = membership.group if membership else None
 
-    return {
+    request._active_group_ctx = {
         "group": group,
         "membership": membership,
         "my_groups": my_groups,
     }
+    return request._active_group_ctx
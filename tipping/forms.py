@@ -5,16 +5,51 @@ from __future__ import annotations
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
 
 from .models import Group, Tournament, Match, BonusPrediction
 
 
 User = get_user_model()
 
+# Teams ändern sich selten → gecacht. Der Key enthält den Stand der Spiele des Turniers
+# (Max(updated_at) + Anzahl): jede Änderung erzeugt einen neuen Key, kein explizites Invalidieren.
+# (Ein cache.delete() würde ohne REDIS_URL nur den LocMemCache des eigenen Prozesses leeren –
+# andere Worker bzw. ein Management-Command erreicht es nicht.)
+TEAM_CHOICES_TIMEOUT = 60 * 60
+
+
+def team_choices_cache_key(tournament_id: int) -> str:
+    state = Match.objects.filter(tournament_id=tournament_id).aggregate(
+        last=Max("updated_at"), n=Count("id"),
+    )
+    last = state["last"].timestamp() if state["last"] else 0
+    return f"bonus_team_choices:{tournament_id}:{last}-{state['n']}"
+
+
+def _teams_for(tournament) -> list[str]:
+    key = team_choices_cache_key(tournament.id)
+    teams = cache.get(key)
+    if teams is None:
+        # DISTINCT + UNION in der DB: liefert nur die ~20 Teams statt aller Spiele
+        homes = Match.objects.filter(tournament=tournament).values_list("home_team", flat=True).distinct()
+        aways = Match.objects.filter(tournament=tournament).values_list("away_team", flat=True).distinct()
+
+        teams = sorted({t.strip() for t in homes.union(aways) if t and t.strip()}, key=str.lower)
+        cache.set(key, teams, TEAM_CHOICES_TIMEOUT)
+    return teams
+
+
+# Name des DB-Index aus Migration 0009 (LOWER(email), case-insensitive eindeutig)
+EMAIL_CI_INDEX = "unique_email_ci"
+
 
 # ---------------------------------------------------------------------
 # Signup
 # ---------------------------------------------------------------------
+
 class SignupForm(UserCreationForm):
     email = forms.EmailField(required=True, label="E-Mail", widget=forms.EmailInput(attrs={"class": "input"}))
 
@@ -26,16 +61,24 @@ class SignupForm(UserCreationForm):
         }
 
     def clean_email(self):
-        email = (self.cleaned_data.get("email") or "").strip().lower()
-        if User.objects.filter(email__iexact=email).exists():
-            raise forms.ValidationError("Este correo ya esta registrado")
-        return email
+        # Nur normalisieren – Eindeutigkeit prüft der DB-Index unique_email_ci beim Speichern
+        return (self.cleaned_data.get("email") or "").strip().lower()
 
     def save(self, commit: bool = True):
         user = super().save(commit=False)
         user.email = (self.cleaned_data.get("email") or "").strip().lower()
         if commit:
-            user.save()
+            try:
+                with transaction.atomic():
+                    user.save()
+            except IntegrityError as exc:
+                # Nur der E-Mail-Index ist ein Formularfehler; alles andere (z.B. paralleler
+                # Signup mit gleichem Username) ist ein echter Fehler und wird weitergereicht
+                if EMAIL_CI_INDEX not in str(exc):
+                    raise
+                error = forms.ValidationError("Este correo ya esta registrado")
+                self.add_error("email", error)
+                raise error
         return user
 
 
@@ -101,40 +144,24 @@ class BonusPredictionForm(forms.Form):
 
     TEAM_FIELDS = ("herbstmeister", "meister", "trainer_first", "topscorer", "relegation1", "relegation2")
 
+    TEAM_WIDGET_ATTRS = {
+        "class": "input",
+        "style": "width:100%; min-width:320px; padding:10px 12px; border:1px solid #ddd; border-radius:10px; background:#fff; color:#111;"
+    }
+
     def __init__(self, *args, tournament=None, **kwargs):
         super().__init__(*args, **kwargs)
 
-        team_choices = [("", "Bitte wählen…")]
-
-        if tournament is not None:
-            qs = (
-                Match.objects
-                .filter(tournament=tournament)
-                .values_list("home_team", "away_team")
-            )
+        teams = _teams_for(tournament) if tournament is not None else []
 
-            teams = set()
-            for home, away in qs:
-                if home and home.strip():
-                    teams.add(home.strip())
-                if away and away.strip():
-                    teams.add(away.strip())
+        # Ein (unveränderliches) Tupel für alle sechs Felder
+        team_choices = (("", "Bitte wählen…"),) + tuple((t, t) for t in teams)
 
-            for t in sorted(teams, key=lambda s: s.lower()):
-                team_choices.append((t, t))
-
-        print("BONUS choices:", len(team_choices), "example:", team_choices[:5])
-
-        # ✅ Wichtig: choices am Feld UND am Widget setzen (damit <option> gerendert wird)
+        # Das Default-Select-Widget behalten: field.choices reicht die choices ans Widget weiter
         for name in self.TEAM_FIELDS:
             field = self.fields[name]
             field.choices = team_choices
-
-            field.widget = forms.Select(attrs={
-                "class": "input",
-                "style": "width:100%; min-width:320px; padding:10px 12px; border:1px solid #ddd; border-radius:10px; background:#fff; color:#111;"
-            })
-            field.widget.choices = team_choices  # 🔥 das ist der Fix für leere <select>
+            field.widget.attrs.update(self.TEAM_WIDGET_ATTRS)
 
     def clean(self):
         cleaned = super().clean()
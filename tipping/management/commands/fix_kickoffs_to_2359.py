@@ -1,5 +1,8 @@
-from datetime import time
+from datetime import time, timedelta
+
 from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.db.models.functions import TruncTime
 from django.utils import timezone
 
 from tipping.models import Match
@@ -19,14 +22,12 @@ class Command(BaseCommand):
         if only_tournament:
             qs = qs.filter(tournament__name=only_tournament)
 
-        changed = 0
-        for m in qs:
-            # Nur ändern, wenn Uhrzeit genau 12:00 ist (dein bisheriger Default)
-            if m.kickoff and m.kickoff.astimezone(tz).time() == time(12, 0):
-                local_dt = m.kickoff.astimezone(tz)
-                new_local = local_dt.replace(hour=23, minute=59, second=0, microsecond=0)
-                m.kickoff = new_local.astimezone(timezone.UTC) if timezone.is_aware(m.kickoff) else new_local
-                m.save(update_fields=["kickoff"])
-                changed += 1
+        # Nur ändern, wenn Uhrzeit (lokal) genau 12:00 ist (dein bisheriger Default).
+        # Filter läuft komplett in SQL (lokale Uhrzeit in tz) → alles in einem UPDATE.
+        changed = (
+            qs.annotate(local_time=TruncTime("kickoff", tzinfo=tz))
+            .filter(local_time=time(12, 0))
+            .update(kickoff=F("kickoff") + timedelta(hours=11, minutes=59), updated_at=timezone.now())
+        )
 
         self.stdout.write(self.style.SUCCESS(f"Kickoffs updated: {changed}"))
@@ -1,13 +1,17 @@
 import csv
 import re
-from datetime import datetime
+from datetime import date, datetime, time
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.utils import timezone
 
 from tipping.models import Tournament, Match
 
+_INT_RE = re.compile(r"\d+")
+_DEFAULT_TIME = time(23, 59)
+
 
 def _pick(row: dict, candidates: list[str]) -> str | None:
     """Return first non-empty value found for any candidate key."""
@@ -19,24 +23,32 @@ def _pick(row: dict, candidates: list[str]) -> str | None:
     return None
 
 
+def _present(fieldnames: list[str], candidates: list[str]) -> list[str]:
+    """Keep only the candidate columns that exist in the CSV header (same order)."""
+    return [key for key in candidates if key in fieldnames]
+
+
 def _parse_datetime(date_str: str | None, time_str: str | None):
     """
     Your CSV provides dateEvent (YYYY-MM-DD) but usually no time.
-    We set a default kickoff time (12:00) so the DateTimeField is valid.
+    We set a default kickoff time (23:59) so the DateTimeField is valid.
     """
     if not date_str:
         return None
 
     date_str = date_str.strip()
 
-    # Format: YYYY-MM-DD
+    # Format: YYYY-MM-DD (fromisoformat ist schneller, strptime erlaubt auch "2026-2-1")
     try:
-        d = datetime.strptime(date_str, "%Y-%m-%d").date()
+        d = date.fromisoformat(date_str)
     except ValueError:
-        return None
+        try:
+            d = datetime.strptime(date_str, "%Y-%m-%d").date()
+        except ValueError:
+            return None
 
-    # If no time present → default to 12:00
-    return datetime.combine(d, datetime.strptime("23:59", "%H:%M").time())
+    # If no time present → default to 23:59
+    return datetime.combine(d, _DEFAULT_TIME)
 
 
 def _to_int(val: str | None):
@@ -47,8 +59,12 @@ def _to_int(val: str | None):
     if s == "":
         return None
 
+    # Fast path: schon eine reine Zahl (z.B. Scores)
+    if s.isdecimal():
+        return int(s)
+
     # Extract first number from strings like "Fecha 1", "Jornada 12", "Round 3"
-    m = re.search(r"\d+", s)
+    m = _INT_RE.search(s)
     if m:
         return int(m.group())
 
@@ -73,6 +89,7 @@ class Command(BaseCommand):
             help="If set, also update home_score/away_score when present in CSV.",
         )
 
+    @transaction.atomic
     def handle(self, *args, **options):
         csv_path = Path(options["csv_path"])
         tournament_name = options["tournament"]
@@ -87,22 +104,49 @@ class Command(BaseCommand):
         updated = 0
         skipped = 0
 
+        # Bestehende Spiele einmal laden statt pro Zeile abzufragen.
+        # Uniqueness strategy: tournament + home + away + kickoff
+        existing = {}
+        for m in (
+            Match.objects
+            .filter(tournament=tournament)
+            .only("id", "home_team", "away_team", "kickoff", "matchday", "home_score", "away_score")
+            .order_by("id")
+            .iterator(chunk_size=1000)
+        ):
+            existing.setdefault((m.home_team, m.away_team, m.kickoff), m)
+
+        new_objs = []
+        updated_objs = {}
+        now = timezone.now()
+
         with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
             reader = csv.DictReader(f)
             if not reader.fieldnames:
                 raise CommandError("CSV has no header row / field names.")
 
+            # Spaltennamen einmal pro Datei auflösen statt pro Zeile alle Kandidaten zu prüfen
+            fields = reader.fieldnames
+            cols_home = _present(fields, ["Equipo local", "strHomeTeam", "HomeTeam", "home_team", "Home", "Team1"])
+            cols_away = _present(fields, ["Equipo visitante", "strAwayTeam", "AwayTeam", "away_team", "Away", "Team2"])
+            cols_timestamp = _present(fields, ["strTimestamp", "timestamp", "dateTime", "datetime"])
+            cols_date = _present(fields, ["dateEvent", "Date", "date", "event_date"])
+            cols_time = _present(fields, ["strTime", "Time", "time", "event_time"])
+            cols_matchday = _present(fields, ["Fecha", "fecha", "matchday", "round"])
+            cols_hs = _present(fields, ["Home Score", "intHomeScore", "HomeScore", "home_score", "score_home"])
+            cols_aws = _present(fields, ["Away Score", "intAwayScore", "AwayScore", "away_score", "score_away"])
+
             for row in reader:
-                home = _pick(row, ["Equipo local", "strHomeTeam", "HomeTeam", "home_team", "Home", "Team1"])
-                away = _pick(row, ["Equipo visitante", "strAwayTeam", "AwayTeam", "away_team", "Away", "Team2"])
+                home = _pick(row, cols_home)
+                away = _pick(row, cols_away)
 
                 # Date / time
-                timestamp = _pick(row, ["strTimestamp", "timestamp", "dateTime", "datetime"])
-                date_event = _pick(row, ["dateEvent", "Date", "date", "event_date"])
-                time_event = _pick(row, ["strTime", "Time", "time", "event_time"])
+                timestamp = _pick(row, cols_timestamp)
+                date_event = _pick(row, cols_date)
+                time_event = _pick(row, cols_time)
 
                 # Matchday (Fecha = Spieltag/Runde)
-                matchday_raw = _pick(row, ["Fecha", "fecha", "matchday", "round"])
+                matchday_raw = _pick(row, cols_matchday)
 
                 kickoff_dt = _parse_datetime(timestamp or date_event, time_event)
 
@@ -116,18 +160,13 @@ class Command(BaseCommand):
                 md = _to_int(matchday_raw)
 
                 # Optional scores
-                hs = _pick(row, ["Home Score", "intHomeScore", "HomeScore", "home_score", "score_home"])
-                aws = _pick(row, ["Away Score", "intAwayScore", "AwayScore", "away_score", "score_away"])
+                hs = _pick(row, cols_hs)
+                aws = _pick(row, cols_aws)
                 hs_i = _to_int(hs)
                 aws_i = _to_int(aws)
 
-                # Uniqueness strategy: tournament + home + away + kickoff
-                obj = Match.objects.filter(
-                    tournament=tournament,
-                    home_team=home,
-                    away_team=away,
-                    kickoff=kickoff,
-                ).first()
+                key = (home, away, kickoff)
+                obj = existing.get(key)
 
                 if obj is None:
                     obj = Match(
@@ -142,7 +181,8 @@ class Command(BaseCommand):
                         obj.home_score = hs_i
                         obj.away_score = aws_i
 
-                    obj.save()
+                    existing[key] = obj
+                    new_objs.append(obj)
                     created += 1
 
                 else:
@@ -161,9 +201,20 @@ class Command(BaseCommand):
                             changed = True
 
                     if changed:
-                        obj.save()
+                        # Neue (noch nicht gespeicherte) Objekte landen ohnehin im bulk_create
+                        if obj.pk is not None:
+                            obj.updated_at = now  # bulk_update setzt auto_now nicht selbst
+                            updated_objs[obj.pk] = obj
                         updated += 1
 
+        # Ganzer Import (inkl. Turnier) läuft in einer Transaktion → ein Commit
+        Match.objects.bulk_create(new_objs, batch_size=500)
+        Match.objects.bulk_update(
+            list(updated_objs.values()),
+            ["matchday", "home_score", "away_score", "updated_at"],
+            batch_size=500,
+        )
+
         self.stdout.write(self.style.SUCCESS(
             f"Import done. Created: {created}, Updated: {updated}, Skipped: {skipped}"
         ))
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-15 09:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tipping', '0007_alter_bonusprediction_bonus_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'kickoff'], name='match_tour_ko_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'matchday'], name='match_tour_md_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='prediction',
+            index=models.Index(fields=['group', 'match'], name='prediction_group_match_idx'),
+        ),
+    ]
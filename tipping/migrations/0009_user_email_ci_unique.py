@@ -0,0 +1,58 @@
+# Generated by Django 6.0.2 on 2026-10-15 09:40
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Vorab prüfen: gibt es E-Mails, die sich nur in Groß/Kleinschreibung unterscheiden
+    (z.B. über Admin/createsuperuser angelegt), würde CREATE UNIQUE INDEX mit einem
+    unklaren DB-Fehler abbrechen. Stattdessen die betroffenen Adressen/User auflisten.
+    """
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    dupes = list(
+        User.objects.exclude(email="")
+        .annotate(email_ci=Lower("email"))
+        .values("email_ci")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("email_ci", flat=True)
+    )
+    if not dupes:
+        return
+
+    lines = []
+    for email_ci in dupes:
+        users = (
+            User.objects.annotate(email_ci=Lower("email"))
+            .filter(email_ci=email_ci)
+            .order_by("id")
+            .values_list("id", "username")
+        )
+        lines.append(f"  {email_ci}: " + ", ".join(f"#{uid} {name}" for uid, name in users))
+
+    raise RuntimeError(
+        "unique_email_ci kann nicht angelegt werden – doppelte E-Mails (ohne Groß/Kleinschreibung):\n"
+        + "\n".join(lines)
+        + "\nBitte E-Mails bereinigen (z.B. im Admin) und migrate erneut ausführen."
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tipping', '0008_match_match_tour_ko_idx_match_match_tour_md_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        # Case-insensitive eindeutige E-Mail (leere E-Mails, z.B. Superuser, ausgenommen)
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX unique_email_ci ON auth_user (LOWER(email)) WHERE email <> '';",
+            reverse_sql="DROP INDEX IF EXISTS unique_email_ci;",
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-15 11:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tipping', '0010_match_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='match',
+            name='match_tour_md_idx',
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'matchday', 'kickoff'], name='match_tour_md_ko_idx'),
+        ),
+    ]
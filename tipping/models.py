@@ -4,6 +4,9 @@ import secrets
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Case, F, IntegerField, Q, When
+from django.db.models.functions import Sign
+from django.db.models.lookups import Exact
 from django.utils import timezone
 
 
@@ -15,7 +18,8 @@ def generate_join_code(length: int = 8) -> str:
     Ohne 0/O und 1/I zur Vermeidung von Verwechslungen.
     """
     alphabet = "23456789" + "ABCDEFGHJKLMNPQRSTUVWXYZ"
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    # 32 Zeichen → die unteren 5 Bit eines Zufallsbytes sind exakt gleichverteilt
+    return "".join(alphabet[b & 31] for b in secrets.token_bytes(length))
 
 
 # --- Models ----------------------------------------------------------------
@@ -43,6 +47,18 @@ class Tournament(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    def season_started(self, now=None) -> bool:
+        # Bonustipps gesperrt/sichtbar ab season_start; `now` durchreichen, wenn der View schon eins hat
+        if self.season_start is None:
+            return False
+        return (now or timezone.now()) >= self.season_start
+
+
+class GroupManager(models.Manager):
+    # __str__ nutzt tournament.name → immer mitladen (Admin-Listen, Selects, ...)
+    def get_queryset(self):
+        return super().get_queryset().select_related("tournament")
+
 
 class Group(models.Model):
     tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name="groups")
@@ -65,6 +81,13 @@ class Group(models.Model):
         default=generate_join_code,
     )
 
+    objects = GroupManager()
+
+    def save(self, *args, **kwargs):
+        # Codes immer in Großbuchstaben speichern → join_group kann exakt (per Index) suchen
+        self.join_code = (self.join_code or "").upper()
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"{self.name} ({self.tournament.name})"
 
@@ -80,6 +103,16 @@ class Match(models.Model):
     home_score = models.IntegerField(null=True, blank=True)
     away_score = models.IntegerField(null=True, blank=True)
 
+    # Stand der Ergebnisse (Cache-Key der Tabelle)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["tournament", "kickoff"], name="match_tour_ko_idx"),
+            # liefert Spiele eines Spieltags bereits nach Anpfiff sortiert
+            models.Index(fields=["tournament", "matchday", "kickoff"], name="match_tour_md_ko_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.home_team} vs {self.away_team}"
 
@@ -109,6 +142,33 @@ class GroupMembership(models.Model):
         return f"{self.user} -> {self.group}"
 
 
+class PredictionQuerySet(models.QuerySet):
+    def with_points(self):
+        """
+        Annotiert `points` direkt in SQL. Einzige Quelle der Punkte-Regeln ist
+        prediction_points_expression():
+        4 = exaktes Ergebnis, 3 = richtige Tordifferenz, 2 = richtige Tendenz, 0 = sonst
+        """
+        return self.annotate(points=prediction_points_expression())
+
+
+def prediction_points_expression():
+    pred_diff = F("pred_home") - F("pred_away")
+    real_diff = F("match__home_score") - F("match__away_score")
+    return Case(
+        When(
+            Q(pred_home__isnull=True) | Q(pred_away__isnull=True)
+            | Q(match__home_score__isnull=True) | Q(match__away_score__isnull=True),
+            then=0,
+        ),
+        When(pred_home=F("match__home_score"), pred_away=F("match__away_score"), then=4),
+        When(Exact(pred_diff, real_diff), then=3),
+        When(Exact(Sign(pred_diff), Sign(real_diff)), then=2),
+        default=0,
+        output_field=IntegerField(),
+    )
+
+
 class Prediction(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="predictions")
@@ -119,10 +179,17 @@ class Prediction(models.Model):
 
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PredictionQuerySet.as_manager()
+
     class Meta:
         constraints = [
+            # deckt auch Abfragen nach (user, group) ab (Tippen-Seite)
             models.UniqueConstraint(fields=["user", "group", "match"], name="unique_prediction")
         ]
+        indexes = [
+            # Tabelle/Spieltag: alle Tipps einer Gruppe für bestimmte Spiele
+            models.Index(fields=["group", "match"], name="prediction_group_match_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user}: {self.match} ({self.pred_home}:{self.pred_away})"
@@ -1,85 +1,92 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import groupby
+from operator import itemgetter
 
 from typing import Optional
 
 
 from django.contrib import messages
-from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.db import IntegrityError, transaction
-from django.http import HttpRequest
-from django.shortcuts import get_object_or_404, redirect, render
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import (
+    BooleanField, Case, Count, ExpressionWrapper, F, IntegerField, Max, Min, Q, Sum, When,
+)
+from django.http import Http404, HttpRequest
+from django.shortcuts import redirect, render
+from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 
 
 from .forms import GroupCreateForm, BonusPredictionForm
-from .models import Group, GroupMembership, Match, Prediction, BonusPrediction
-
-User = get_user_model()
+from .models import (
+    Group, GroupMembership, Match, Prediction, BonusPrediction, prediction_points_expression,
+)
+
+TABELLE_CACHE_TIMEOUT = 60 * 60
+USER_STATS_CACHE_TIMEOUT = 60 * 60
+
+# Punkte (4/3/2) -> Trefferkategorie in user_stats, alles andere ist "Kein Treffer"
+HIT_LABELS = {4: "Ergebnis", 3: "Tordifferenz", 2: "Tendenz"}
+# Vorzeichen der Tipp-Differenz -> Tendenz
+TENDENCY_LABELS = {1: "Heim", 0: "Remis", -1: "Gast"}
+
+
+@dataclass(slots=True)
+class TableRow:
+    """Eine Zeile der getippten Ligatabelle in user_stats (Template liest nur Attribute)."""
+    pos: int
+    team: str
+    played: int
+    wins: int
+    draws: int
+    losses: int
+    gf: int
+    ga: int
+    gd: int
+    points: int
 
 
 # ---------------------------------------------------------------------
 # Scoring
 # ---------------------------------------------------------------------
 
-def _outcome(h: int, a: int) -> int:
-    """1=Heimsieg, 0=Remis, -1=Auswärtssieg"""
-    return (h > a) - (h < a)
+def _norm(s: str) -> str:
+    return (s or "").strip().lower()
 
 
-def points_for_prediction(match: Match, pred: Prediction | None) -> int:
-    """
-    Kicktipp-like:
-    4 = exaktes Ergebnis
-    3 = richtige Tordifferenz
-    2 = richtige Tendenz (S/U/N)
-    0 = falsch / keine Daten
+def _tournament_bonus_targets(tournament) -> dict:
     """
-    if pred is None:
-        return 0
-    if match.home_score is None or match.away_score is None:
-        return 0
-    if pred.pred_home is None or pred.pred_away is None:
-        return 0
-
-    # 3 Punkte: exakter Tipp
-    if pred.pred_home == match.home_score and pred.pred_away == match.away_score:
-        return 4
-
-    # 2 Punkte: richtige Tordifferenz
-    if (pred.pred_home - pred.pred_away) == (match.home_score - match.away_score):
-        return 3
-
-    # 1 Punkt: richtige Tendenz
-    if _outcome(pred.pred_home, pred.pred_away) == _outcome(match.home_score, match.away_score):
-        return 2
+    Normalisierte offizielle Bonus-Ergebnisse eines Turniers.
+    Einmal pro Request berechnen und an bonus_points_for_user übergeben.
 
-    return 0
+    Tournament-Felder:
+      autumn_champion, champion, first_coach_sacked, top_scorer, relegated_teams (kommagetrennt)
+    """
+    relegated_raw = getattr(tournament, "relegated_teams", "") or ""
+    return {
+        "herbstmeister": _norm(getattr(tournament, "autumn_champion", "")),
+        "meister": _norm(getattr(tournament, "champion", "")),
+        "trainer_first": _norm(getattr(tournament, "first_coach_sacked", "")),
+        "topscorer": _norm(getattr(tournament, "top_scorer", "")),
+        "relegation": {_norm(x) for x in relegated_raw.split(",") if _norm(x)},
+    }
 
 
-def bonus_points_for_user(tournament, preds: list[BonusPrediction]) -> int:
+def bonus_points_for_user(targets: dict, preds: list[BonusPrediction]) -> int:
     """
     +5 Punkte pro richtigem Bonustipp.
 
-    Tournament-Felder:
-      autumn_champion, champion, first_coach_sacked, top_scorer, relegated_teams (kommagetrennt)
+    targets: siehe _tournament_bonus_targets
 
     BonusPrediction-Typen:
       herbstmeister, meister, trainer_first, topscorer, relegation1, relegation2
     """
-    def _norm(s: str) -> str:
-        return (s or "").strip().lower()
-
-    real_herbst = _norm(getattr(tournament, "autumn_champion", ""))
-    real_meister = _norm(getattr(tournament, "champion", ""))
-    real_trainer = _norm(getattr(tournament, "first_coach_sacked", ""))
-    real_topscorer = _norm(getattr(tournament, "top_scorer", ""))
-
-    relegated_raw = getattr(tournament, "relegated_teams", "") or ""
-    relegated_set = {_norm(x) for x in relegated_raw.split(",") if _norm(x)}
+    relegated_set = targets["relegation"]
 
     pts = 0
 
@@ -93,23 +100,28 @@ def bonus_points_for_user(tournament, preds: list[BonusPrediction]) -> int:
         if not val:
             continue
 
-        if btype == "herbstmeister" and real_herbst and val == real_herbst:
-            pts += 5
-
-        elif btype == "meister" and real_meister and val == real_meister:
-            pts += 5
+        if btype in {"relegation1", "relegation2"}:
+            if val in relegated_set and val not in counted_relegations:
+                pts += 5
+                counted_relegations.add(val)
+            continue
 
-        elif btype == "trainer_first" and real_trainer and val == real_trainer:
+        real = targets.get(btype)
+        if real and val == real:
             pts += 5
 
-        elif btype == "topscorer" and real_topscorer and val == real_topscorer:
-            pts += 5
+    return pts
 
-        elif btype in {"relegation1", "relegation2"} and relegated_set and val in relegated_set:
-            if val not in counted_relegations:
-                pts += 5
-                counted_relegations.add(val)
 
+def _bonus_points_memo(memo: dict, targets: dict, preds: list[BonusPrediction]) -> int:
+    """
+    bonus_points_for_user mit view-lokalem Cache: gleiche Tipps -> gleiche Punkte.
+    memo gehört zu genau einem Turnier (targets), daher reichen die Tipps als Key.
+    """
+    key = frozenset((bp.bonus_type, bp.value) for bp in preds)
+    pts = memo.get(key)
+    if pts is None:
+        pts = memo[key] = bonus_points_for_user(targets, preds)
     return pts
 
 
@@ -157,37 +169,89 @@ def _require_active_membership(request) -> Optional[GroupMembership]:
     if not request.user.is_authenticated:
         return None
 
-    active_group_id = request.session.get("active_group_id")
+    # Pro Request nur einmal auflösen (auch None = "keine Gruppe" wird gemerkt)
+    if hasattr(request, "_active_membership"):
+        return request._active_membership
 
-    # 1) Wenn aktive Gruppe gesetzt ist: Membership dafür holen
-    if active_group_id:
-        membership = (
-            GroupMembership.objects
-            .filter(user=request.user, group_id=active_group_id)
-            .select_related("group__tournament")
-            .first()
-        )
-        if membership:
-            return membership
+    active_group_id = request.session.get("active_group_id")
 
-    # 2) Fallback: erste Membership nehmen
+    # 1) + 2) in einer Query: Membership der aktiven Gruppe zuerst, sonst die erste nach id
     membership = (
         GroupMembership.objects
         .filter(user=request.user)
+        .annotate(is_active=Case(
+            When(group_id=active_group_id, then=0),
+            default=1,
+            output_field=IntegerField(),
+        ))
         .select_related("group__tournament")
-        .order_by("id")
+        .order_by("is_active", "id")
         .first()
     )
-    if membership:
+    if membership and membership.is_active:
+        # Fallback: aktive Gruppe fehlt/ungültig -> Session reparieren
         request.session["active_group_id"] = membership.group_id
-        return membership
 
-    # 3) Keine Gruppe vorhanden
-    return None
+    # 3) membership ist None, wenn keine Gruppe vorhanden
+    request._active_membership = membership
+    return membership
 
 
 
 
+def _set_active_group(request, group_id: int) -> None:
+    """
+    Aktive Gruppe in der Session setzen – nur wenn sie sich ändert
+    (jede Zuweisung markiert die Session als geändert → Schreibzugriff aufs Session-Backend).
+    """
+    if request.session.get("active_group_id") != group_id:
+        request.session["active_group_id"] = group_id
+
+
+def _group_users(request, group):
+    """
+    Alle User der Gruppe, pro Request nur einmal geladen.
+    Reihenfolge: Username case-insensitive (lower() einmal pro User) – die Tabellen-Sortierungen
+    sind stabil und brauchen deshalb nur noch die Punkte als Schlüssel.
+    """
+    memo = getattr(request, "_group_users_cache", None)
+    if memo is None:
+        memo = request._group_users_cache = {}
+
+    if group.id not in memo:
+        memberships = list(
+            GroupMembership.objects
+            .filter(group=group)
+            .select_related("user")
+            .order_by("user__username")
+        )
+        memberships.sort(key=lambda m: m.user.username.lower())
+        memo[group.id] = memberships
+    return [m.user for m in memo[group.id]]
+
+
+def _matchday_index(request, tournament, now):
+    """
+    Sortierte Liste [(matchday, nächster Anpfiff >= now oder None), ...] des Turniers.
+    Eine Query pro Request; Auswahl, Prev/Next und Tabelle rechnen daraus in Python.
+    """
+    memo = getattr(request, "_matchday_index_cache", None)
+    if memo is None:
+        memo = request._matchday_index_cache = {}
+
+    if tournament.id not in memo:
+        memo[tournament.id] = list(
+            Match.objects
+            .filter(tournament=tournament)
+            .exclude(matchday__isnull=True)
+            .values("matchday")
+            .annotate(next_ko=Min("kickoff", filter=Q(kickoff__gte=now)))
+            .order_by("matchday")
+            .values_list("matchday", "next_ko")
+        )
+    return memo[tournament.id]
+
+
 def _get_selected_matchday(request, tournament, now):
     """
     Default:
@@ -196,6 +260,7 @@ def _get_selected_matchday(request, tournament, now):
     Optional:
       - ?md=3 erzwingt Spieltag 3 (wenn existiert)
     """
+    index = _matchday_index(request, tournament, now)
 
     # 1) Falls md explizit gesetzt ist: nutzen (wenn es diesen Spieltag gibt)
     md_param = request.GET.get("md")
@@ -205,49 +270,325 @@ def _get_selected_matchday(request, tournament, now):
         except ValueError:
             selected_md = None
 
-        if selected_md is not None:
-            exists = Match.objects.filter(tournament=tournament, matchday=selected_md).exists()
-            if exists:
-                return selected_md
+        if selected_md is not None and any(md == selected_md for md, _ko in index):
+            return selected_md
 
     # 2) Default: nächstes zukünftiges Spiel
-    next_match = (
-        Match.objects
-        .filter(tournament=tournament, kickoff__gte=now)
-        .exclude(matchday__isnull=True)
-        .order_by("kickoff")
-        .first()
-    )
-    if next_match:
-        return next_match.matchday
+    upcoming = [(ko, md) for md, ko in index if ko is not None]
+    if upcoming:
+        return min(upcoming)[1]
 
     # 3) Fallback: letzter Spieltag im Turnier (wenn keine zukünftigen Spiele mehr existieren)
-    last_md = (
+    return index[-1][0] if index else None  # kann None sein, wenn es gar keine Matches gibt
+
+
+
+def _prev_next_md(request, tournament, now, matchday):
+    mds = [md for md, _ko in _matchday_index(request, tournament, now)]
+    prev_md = max((md for md in mds if md < matchday), default=None)
+    next_md = min((md for md in mds if md > matchday), default=None)
+    return prev_md, next_md
+
+
+def _tabelle_scores(group, tournament, shown_matchdays):
+    """
+    Punkte für die Tabelle direkt in SQL (GROUP BY über Prediction.with_points()):
+      totals[user_id]            = Σ über alle Spiele mit Ergebnis
+      md_totals[(user_id, md)]   = Punkte pro Spieltag im Fenster
+      scored_mds                 = Spieltage im Fenster mit mindestens einem Ergebnis
+    """
+    finished_preds = (
+        Prediction.objects
+        .filter(
+            group=group,
+            match__tournament=tournament,
+            match__home_score__isnull=False,
+            match__away_score__isnull=False,
+        )
+        .with_points()
+    )
+
+    totals = {
+        row["user_id"]: row["total"]
+        for row in finished_preds.values("user_id").annotate(total=Sum("points"))
+    }
+
+    # Nur die drei benötigten Spalten, keine Match-Instanzen
+    matches = (
         Match.objects
-        .filter(tournament=tournament)
-        .exclude(matchday__isnull=True)
-        .order_by("-matchday")
-        .values_list("matchday", flat=True)
-        .first()
+        .filter(tournament=tournament, matchday__in=shown_matchdays)
+        .order_by("matchday", "kickoff", "home_team")
+        .values("matchday", "home_score", "away_score")
     )
-    return last_md  # kann None sein, wenn es gar keine Matches gibt
 
+    # Query ist nach matchday sortiert -> zusammenhängende Blöcke, groupby reicht
+    matches_by_md = {
+        md: list(rows)
+        for md, rows in groupby(matches, key=itemgetter("matchday"))
+    }
+    for md in shown_matchdays:
+        matches_by_md.setdefault(md, [])
+
+    # Punkte pro (User, Spieltag) für das Fenster – ebenfalls ein GROUP BY
+    md_totals = {
+        (row["user_id"], row["match__matchday"]): row["total"]
+        for row in (
+            finished_preds
+            .filter(match__matchday__in=shown_matchdays)
+            .values("user_id", "match__matchday")
+            .annotate(total=Sum("points"))
+        )
+    }
 
+    # Spieltage im Fenster, an denen schon mindestens ein Ergebnis existiert
+    scored_mds = {
+        md for md, md_matches in matches_by_md.items()
+        if any(m["home_score"] is not None and m["away_score"] is not None for m in md_matches)
+    }
 
-def _prev_next_md(tournament, matchday):
-    prev_md = (
-        Match.objects.filter(tournament=tournament, matchday__lt=matchday)
-        .order_by("-matchday")
-        .values_list("matchday", flat=True)
-        .first()
+    return totals, md_totals, scored_mds
+
+
+def _state_stamp(qs) -> str:
+    """
+    Stand einer Tabelle für Cache-Keys: letzte Änderung (updated_at) + Anzahl Zeilen
+    (Anzahl fängt Löschungen ab, die Max(updated_at) nicht verändern).
+    """
+    state = qs.aggregate(last=Max("updated_at"), n=Count("id"))
+    last = state["last"].timestamp() if state["last"] else 0
+    return f"{last}-{state['n']}"
+
+
+def _tabelle_scores_cached(group, tournament, shown_matchdays):
+    """
+    _tabelle_scores mit Cache. Der Key enthält den Stand der Tipps (Gruppe) und der
+    Spiele (Turnier) – jede Änderung erzeugt einen neuen Key, kein explizites Invalidieren.
+    """
+    key = (
+        f"tabelle:{group.id}:{shown_matchdays[0]}-{shown_matchdays[-1]}:{len(shown_matchdays)}"
+        f":{_state_stamp(Prediction.objects.filter(group=group))}"
+        f":{_state_stamp(Match.objects.filter(tournament=tournament))}"
     )
-    next_md = (
-        Match.objects.filter(tournament=tournament, matchday__gt=matchday)
-        .order_by("matchday")
-        .values_list("matchday", flat=True)
-        .first()
+    return cache.get_or_set(
+        key,
+        lambda: _tabelle_scores(group, tournament, shown_matchdays),
+        TABELLE_CACHE_TIMEOUT,
     )
-    return prev_md, next_md
+
+
+def _user_stats_payload(group, tournament, target_user) -> dict:
+    """
+    Alle Kennzahlen für user_stats (ohne group/target_user), picklebar für den Cache.
+    """
+    # Nur Spiele mit Ergebnis (sonst kann man keine Punkte/Tabellen berechnen)
+    matches_with_result = Match.objects.filter(
+        tournament=tournament,
+        home_score__isnull=False,
+        away_score__isnull=False,
+    )
+
+    # Nur die benötigten Spalten als Tupel, Punkte (4/3/2/0) direkt aus SQL;
+    # leere Tipps werden schon in der Query ignoriert
+    tips = Prediction.objects.filter(
+        group=group,
+        user=target_user,
+        match__in=matches_with_result,
+        pred_home__isnull=False,
+        pred_away__isnull=False,
+    )
+    rows = list(tips.with_points().values_list("pred_home", "pred_away", "points"))
+    total_predictions = len(rows)  # jede Zeile = genau ein Tipp in tip_counts
+
+    tip_counts = Counter({"Heim": 0, "Remis": 0, "Gast": 0})
+    hit_counts = Counter({"Kein Treffer": 0, "Tendenz": 0, "Tordifferenz": 0, "Ergebnis": 0})
+    scoreline_counts = Counter()
+    team_points = Counter()
+
+    # Getippte Tabelle als parallele Listen (ein int pro Team und Spalte, keine dict-of-dicts);
+    # Index = Reihenfolge des ersten Auftretens
+    team_idx: dict[str, int] = {}
+    played: list[int] = []
+    wins: list[int] = []
+    draws: list[int] = []
+    losses: list[int] = []
+    gf: list[int] = []
+    ga: list[int] = []
+    table_pts: list[int] = []
+
+    def _idx(team: str) -> int:
+        i = team_idx.get(team)
+        if i is None:
+            i = team_idx[team] = len(played)
+            for col in (played, wins, draws, losses, gf, ga, table_pts):
+                col.append(0)
+        return i
+
+    # D) + E) Team-Punkte und getippte Tabelle: je ein GROUP BY für Heim- und Auswärtsseite,
+    # in Python nur zusammengeführt.
+    # Spalten: team, played, gf, ga, wins, draws, losses (aus Sicht des Teams), Tipp-Punkte
+    def _side_rows(team_field: str, own: str, other: str):
+        return (
+            tips.with_points()
+            .values(team_field)
+            .annotate(
+                played=Count("id"),
+                goals_for=Sum(own),
+                goals_against=Sum(other),
+                won=Count("id", filter=Q(**{f"{own}__gt": F(other)})),
+                drawn=Count("id", filter=Q(**{own: F(other)})),
+                lost=Count("id", filter=Q(**{f"{own}__lt": F(other)})),
+                tip_points=Sum("points"),
+            )
+            .order_by()
+            .values_list(
+                team_field, "played", "goals_for", "goals_against", "won", "drawn", "lost", "tip_points",
+            )
+        )
+
+    for side in (
+        _side_rows("match__home_team", "pred_home", "pred_away"),
+        _side_rows("match__away_team", "pred_away", "pred_home"),
+    ):
+        side = list(side)
+        # Heim + Auswärts per Counter.update(mapping) addieren
+        # (update statt "+", damit Teams mit 0 Punkten für die Flop-Liste erhalten bleiben)
+        team_points.update({row[0]: row[-1] for row in side})
+
+        for team, n, goals_for, goals_against, won, drawn, lost, _tip_points in side:
+            i = _idx(team)
+            played[i] += n
+            gf[i] += goals_for
+            ga[i] += goals_against
+            wins[i] += won
+            draws[i] += drawn
+            losses[i] += lost
+            table_pts[i] += 3 * won + drawn
+
+    # A) Heim/Remis/Gast, B) Trefferkategorie, C) Scorelines: je ein Counter.update über einen Generator
+    tip_counts.update(TENDENCY_LABELS[(ph > pa) - (ph < pa)] for ph, pa, _pts in rows)
+    hit_counts.update(HIT_LABELS.get(pts, "Kein Treffer") for _ph, _pa, pts in rows)
+    scoreline_counts.update(f"{ph}:{pa}" for ph, pa, _pts in rows)
+
+    top_scores = scoreline_counts.most_common(3)
+
+    # Einmal sortieren (Punkte aufsteigend, dann Name; lower() nur einmal pro Team) und beide Enden nehmen.
+    # ~20 Teams: ein sort() ist billiger als zwei heapq-Läufe.
+    keyed = sorted(((pts, team.lower(), team) for team, pts in team_points.items()), key=itemgetter(0, 1))
+    bottom_teams = [(team, pts) for pts, _lc, team in keyed[:10]]
+
+    # Top: von hinten nach Punkten gruppieren, innerhalb gleicher Punkte bleibt der Name aufsteigend
+    top_keyed = []
+    for _pts, same_pts in groupby(reversed(keyed), key=itemgetter(0)):
+        top_keyed.extend(reversed(list(same_pts)))
+        if len(top_keyed) >= 10:
+            break
+    top_teams = [(team, pts) for pts, _lc, team in top_keyed[:10]]
+
+    # Sortierung auf den Spalten (Punkte, Tordifferenz, Tore, Name), Rows erst danach bauen
+    gd = [f - a for f, a in zip(gf, ga)]
+    order = sorted(
+        ((-table_pts[i], -gd[i], -gf[i], team.lower(), team, i) for team, i in team_idx.items()),
+        key=itemgetter(0, 1, 2, 3),
+    )
+    predicted_table_rows = [
+        TableRow(
+            pos=pos,
+            team=team,
+            played=played[i],
+            wins=wins[i],
+            draws=draws[i],
+            losses=losses[i],
+            gf=gf[i],
+            ga=ga[i],
+            gd=gd[i],
+            points=table_pts[i],
+        )
+        for pos, (*_key, team, i) in enumerate(order, start=1)
+    ]
+
+    return {
+        "tip_counts": dict(tip_counts),
+        "hit_counts": dict(hit_counts),
+
+        "top_scores": top_scores,
+        "top_teams": top_teams,
+        "bottom_teams": bottom_teams,
+
+        "predicted_table_rows": predicted_table_rows,
+        "total_predictions": total_predictions,
+    }
+
+
+def _upsert_predictions(user, group, preds: list[Prediction]) -> None:
+    """
+    Speichert neue/geänderte Tipps eines Users mit möglichst wenigen Statements.
+    """
+    # Ein Upsert (INSERT ... ON CONFLICT DO UPDATE) statt update_or_create pro Spiel
+    if connection.features.supports_update_conflicts_with_target:
+        Prediction.objects.bulk_create(
+            preds,
+            update_conflicts=True,
+            unique_fields=["user", "group", "match"],
+            update_fields=["pred_home", "pred_away", "updated_at"],
+        )
+        return
+
+    # Fallback ohne ON CONFLICT: vorhandene Tipps einmal laden → ein bulk_update + ein bulk_create
+    existing = {
+        p.match_id: p
+        for p in Prediction.objects.filter(
+            user=user, group=group, match_id__in=[p.match_id for p in preds]
+        )
+    }
+    now = timezone.now()
+    updates, creates = [], []
+    for p in preds:
+        old = existing.get(p.match_id)
+        if old is None:
+            creates.append(p)
+        else:
+            old.pred_home = p.pred_home
+            old.pred_away = p.pred_away
+            old.updated_at = now  # bulk_update setzt auto_now nicht selbst
+            updates.append(old)
+
+    with transaction.atomic():
+        Prediction.objects.bulk_update(updates, ["pred_home", "pred_away", "updated_at"])
+        Prediction.objects.bulk_create(creates)
+
+
+def _upsert_bonus_predictions(user, group, preds: list[BonusPrediction]) -> None:
+    """
+    Speichert alle Bonustipps eines Users in einem Statement (wie _upsert_predictions).
+    """
+    if connection.features.supports_update_conflicts_with_target:
+        BonusPrediction.objects.bulk_create(
+            preds,
+            update_conflicts=True,
+            unique_fields=["user", "group", "bonus_type"],  # = unique_bonus_prediction_per_group
+            update_fields=["value", "updated_at"],
+        )
+        return
+
+    # Fallback ohne ON CONFLICT: vorhandene Bonustipps einmal laden → ein bulk_update + ein bulk_create
+    existing = {
+        bp.bonus_type: bp
+        for bp in BonusPrediction.objects.filter(user=user, group=group)
+    }
+    now = timezone.now()
+    updates, creates = [], []
+    for bp in preds:
+        old = existing.get(bp.bonus_type)
+        if old is None:
+            creates.append(bp)
+        else:
+            old.value = bp.value
+            old.updated_at = now  # bulk_update setzt auto_now nicht selbst
+            updates.append(old)
+
+    with transaction.atomic():
+        BonusPrediction.objects.bulk_update(updates, ["value", "updated_at"])
+        BonusPrediction.objects.bulk_create(creates)
 
 
 # ---------------------------------------------------------------------
@@ -278,39 +619,28 @@ def tippen(request):
             "now": now,
         })
 
-    def _matches_for_md(md: int):
-        return (
-            Match.objects
-            .filter(tournament=tournament, matchday=md)
-            .order_by("kickoff", "home_team")
-        )
-
-    matches = _matches_for_md(matchday)
-
-    # Falls aus irgendeinem Grund md leer ist → nochmal Default bestimmen
-    if not matches.exists():
-        matchday = _get_selected_matchday(request, tournament, now)
-        if matchday is None:
-            return render(request, "tipping/tippen.html", {
-                "group": group,
-                "matchday": None,
-                "rows": [],
-                "prev_md": None,
-                "next_md": None,
-                "now": now,
-            })
-        matches = _matches_for_md(matchday)
+    # Einmal materialisieren: Tipp-Lookup, Rows und POST-Schleife nutzen dieselbe Liste.
+    # matchday kommt aus _matchday_index, hat also Spiele -> kein extra exists()/Neuwahl nötig.
+    # Sperre einmal pro Request in SQL berechnen (ein "now" für alle Zeilen)
+    matches = list(
+        Match.objects
+        .filter(tournament=tournament, matchday=matchday)
+        .annotate(is_locked_ann=ExpressionWrapper(Q(kickoff__lte=now), output_field=BooleanField()))
+        .order_by("kickoff", "home_team")
+    )
 
-    prev_md, next_md = _prev_next_md(tournament, matchday)
+    prev_md, next_md = _prev_next_md(request, tournament, now, matchday)
 
     preds = {
         p.match_id: p
-        for p in Prediction.objects.filter(user=request.user, group=group, match__in=matches)
+        for p in Prediction.objects.filter(
+            user=request.user, group=group, match_id__in=[m.id for m in matches]
+        )
     }
     rows = [{"match": m, "pred": preds.get(m.id)} for m in matches]
 
     if request.method == "POST":
-        saved = 0
+        to_save = []
         skipped_locked = 0
         now = timezone.now()  # Locking immer mit aktuellem "jetzt"
 
@@ -337,13 +667,11 @@ def tippen(request):
             except ValueError:
                 continue
 
-            Prediction.objects.update_or_create(
-                user=request.user,
-                group=group,
-                match=m,
-                defaults={"pred_home": ph, "pred_away": pa},
-            )
-            saved += 1
+            to_save.append(Prediction(user=request.user, group=group, match=m, pred_home=ph, pred_away=pa))
+
+        if to_save:
+            _upsert_predictions(request.user, group, to_save)
+        saved = len(to_save)
 
         if saved > 0:
             if skipped_locked > 0:
@@ -385,23 +713,14 @@ def spieltag(request):
 
     # Bonustipps sind für alle erst sichtbar, wenn season_start gesetzt UND erreicht
     season_start = tournament.season_start
-    bonus_reveal = bool(season_start and now >= season_start)
+    bonus_reveal = tournament.season_started(now)
 
     # --- Spieler in Gruppe ---
-    memberships = list(
-        GroupMembership.objects
-        .filter(group=group)
-        .select_related("user")
-        .order_by("user__username")
-    )
-    users = [m.user for m in memberships]
+    users = _group_users(request, group)
 
-    # --- BONUSTAB ---
-    bonus_rows = []
-    my_bonus = None
-
-    if tab == "bonus":
-        # lade alle Bonustipps der Gruppe
+    # --- Bonustipps der Gruppe: einmal laden (Bonustab + Bonuspunkte im Matchtab) ---
+    bonus_by_user = defaultdict(list)
+    if tab == "bonus" or bonus_reveal:
         all_bonus = list(
             BonusPrediction.objects
             .filter(group=group, tournament=tournament, user__in=users)
@@ -409,17 +728,25 @@ def spieltag(request):
         )
 
         # gruppieren: user_id -> list[BonusPrediction]
-        bonus_by_user = defaultdict(list)
         for bp in all_bonus:
             bonus_by_user[bp.user_id].append(bp)
 
+    # Bonuspunkte werden im Bonustab und im Matchtab gebraucht -> Ziele + Cache einmal
+    targets = _tournament_bonus_targets(tournament) if bonus_reveal else None
+    bonus_pts_cache: dict[frozenset, int] = {}
+
+    # --- BONUSTAB ---
+    bonus_rows = []
+    my_bonus = None
+
+    if tab == "bonus":
         # eigene Bonustipps (für Anzeige vor Lock)
         my_bonus = bonus_by_user.get(request.user.id, [])
 
         if bonus_reveal:
             for u in users:
                 preds = bonus_by_user.get(u.id, [])
-                pts = bonus_points_for_user(tournament, preds)
+                pts = _bonus_points_memo(bonus_pts_cache, targets, preds)
                 by_type = {p.bonus_type: p.value for p in preds}
 
                 bonus_rows.append({
@@ -435,7 +762,7 @@ def spieltag(request):
                     }
                 })
 
-            bonus_rows.sort(key=lambda r: (-r["points"], r["user"].username.lower()))
+            bonus_rows.sort(key=itemgetter("points"), reverse=True)  # stabil: users schon nach Name
 
     # --- MATCHTAB (dein bisheriger Code) ---
     # (Hier bleibt dein bisheriger Matchday/Matrix-Code, nur: total_points += bonus_points wenn reveal)
@@ -459,14 +786,27 @@ def spieltag(request):
 
     matches = list(
         Match.objects.filter(tournament=tournament, matchday=matchday)
+        .annotate(reveal=ExpressionWrapper(Q(kickoff__lte=now), output_field=BooleanField()))
         .order_by("kickoff", "home_team")
     )
-    prev_md, next_md = _prev_next_md(tournament, matchday)
+    prev_md, next_md = _prev_next_md(request, tournament, now, matchday)
 
     all_preds = (
         Prediction.objects
-        .filter(group=group, match__in=matches, user__in=users)
-        .select_related("user", "match")
+        .filter(
+            group=group,
+            match_id__in=[m.id for m in matches],
+            user_id__in=[u.id for u in users],
+        )
+        # user liegt schon in users -> kein JOIN auf auth_user; von match nur die Spalten,
+        # die reveal_pts unten braucht (kickoff, Ergebnis) statt der ganzen Match-Zeile
+        .only("user_id", "match_id", "pred_home", "pred_away")
+        # Punkte je Tipp in SQL, NULL solange das Spiel noch nicht angepfiffen ist
+        .annotate(reveal_pts=Case(
+            When(match__kickoff__lte=now, then=prediction_points_expression()),
+            default=None,
+            output_field=IntegerField(),
+        ))
     )
     pred_map = {(p.user_id, p.match_id): p for p in all_preds}
 
@@ -483,16 +823,10 @@ def spieltag(request):
     # Bonuspunkte (pro User) nur addieren, wenn reveal
     bonus_points_map = {}
     if bonus_reveal:
-        all_bonus = list(
-            BonusPrediction.objects
-            .filter(group=group, tournament=tournament, user__in=users)
-            .select_related("user")
-        )
-        bonus_by_user = defaultdict(list)
-        for bp in all_bonus:
-            bonus_by_user[bp.user_id].append(bp)
         for u in users:
-            bonus_points_map[u.id] = bonus_points_for_user(tournament, bonus_by_user.get(u.id, []))
+            bonus_points_map[u.id] = _bonus_points_memo(
+                bonus_pts_cache, targets, bonus_by_user.get(u.id, [])
+            )
     else:
         for u in users:
             bonus_points_map[u.id] = 0
@@ -503,14 +837,16 @@ def spieltag(request):
         cells = []
 
         for m in matches:
-            reveal = (m.kickoff <= now)
             p = pred_map.get((u.id, m.id))
 
-            cell_points = points_for_prediction(m, p) if reveal else None
+            if p is not None:
+                cell_points = p.reveal_pts
+            else:
+                cell_points = 0 if m.reveal else None
             if cell_points is not None:
                 total_points += cell_points
 
-            cells.append({"reveal": reveal, "pred": p, "points": cell_points})
+            cells.append({"reveal": m.reveal, "pred": p, "points": cell_points})
 
         # ✅ Bonuspunkte (nur wenn reveal, sonst 0)
         total_points_with_bonus = total_points + bonus_points_map.get(u.id, 0)
@@ -525,9 +861,9 @@ def spieltag(request):
 
     # sortiert nach Total inkl Bonus sobald reveal
     if bonus_reveal:
-        table_rows.sort(key=lambda r: (-r["total_with_bonus"], r["user"].username.lower()))
+        table_rows.sort(key=itemgetter("total_with_bonus"), reverse=True)
     else:
-        table_rows.sort(key=lambda r: (-r["total_points"], r["user"].username.lower()))
+        table_rows.sort(key=itemgetter("total_points"), reverse=True)
 
     return render(request, "tipping/spieltag.html", {
         "group": group,
@@ -559,7 +895,7 @@ def tabelle(request):
     # ✅ Bonus erst sichtbar/gewertet, wenn season_start erreicht ist
     now = timezone.now()
     season_start = tournament.season_start
-    bonus_reveal = bool(season_start and now >= season_start)
+    bonus_reveal = tournament.season_started(now)
 
     # --- View Tab (mdpoints / ranks / rankdiff) -----------------------------
     view = request.GET.get("view", "mdpoints")
@@ -580,14 +916,7 @@ def tabelle(request):
     count = max(4, min(count, 15))
 
     # --- Alle Spieltage im Turnier -----------------------------------------
-    matchdays = list(
-        Match.objects
-        .filter(tournament=tournament)
-        .exclude(matchday__isnull=True)
-        .values_list("matchday", flat=True)
-        .distinct()
-        .order_by("matchday")
-    )
+    matchdays = [md for md, _ko in _matchday_index(request, tournament, now)]
 
     if not matchdays:
         return render(request, "tipping/tabelle.html", {
@@ -615,31 +944,12 @@ def tabelle(request):
     next_from = from_idx + count if (from_idx + count) < len(matchdays) else None
 
     # --- Alle Spieler der Gruppe -------------------------------------------
-    memberships = list(
-        GroupMembership.objects
-        .filter(group=group)
-        .select_related("user")
-        .order_by("user__username")
-    )
-    users = [m.user for m in memberships]
+    users = _group_users(request, group)
 
     # ----------------------------------------------------------------------
-    # Σ = Gesamtpunkte über ALLE Spieltage (nur Matches mit Ergebnis)
+    # Σ + Punkte pro Spieltag im Fenster (gecacht, solange sich Tipps/Ergebnisse nicht ändern)
     # ----------------------------------------------------------------------
-    finished_preds = (
-        Prediction.objects
-        .filter(
-            group=group,
-            match__tournament=tournament,
-            match__home_score__isnull=False,
-            match__away_score__isnull=False,
-        )
-        .select_related("match", "user")
-    )
-
-    total_points_all = {u.id: 0 for u in users}
-    for pr in finished_preds:
-        total_points_all[pr.user_id] = total_points_all.get(pr.user_id, 0) + points_for_prediction(pr.match, pr)
+    totals, md_totals, scored_mds = _tabelle_scores_cached(group, tournament, shown_matchdays)
 
     # ----------------------------------------------------------------------
     # ✅ BONUS: +5 Punkte pro richtigem Bonustipp (nur wenn Bonus "reveal")
@@ -650,95 +960,52 @@ def tabelle(request):
         all_bonus = list(
             BonusPrediction.objects
             .filter(group=group, tournament=tournament, user__in=users)
-            .select_related("user")
         )
 
         bonus_by_user = defaultdict(list)
         for bp in all_bonus:
             bonus_by_user[bp.user_id].append(bp)
 
+        targets = _tournament_bonus_targets(tournament)
+        bonus_pts_cache: dict[frozenset, int] = {}
         for u in users:
-            bonus_points_by_user[u.id] = bonus_points_for_user(
-                tournament,
+            bonus_points_by_user[u.id] = _bonus_points_memo(
+                bonus_pts_cache,
+                targets,
                 bonus_by_user.get(u.id, [])
             )
 
-        # Bonuspunkte auf Σ draufaddieren
-        for u in users:
-            total_points_all[u.id] = total_points_all.get(u.id, 0) + bonus_points_by_user.get(u.id, 0)
-
-    # ----------------------------------------------------------------------
-    # Spalten-Fenster: md_points / ranks / rankdiff nur für shown_matchdays
-    # ----------------------------------------------------------------------
-    matches = list(
-        Match.objects
-        .filter(tournament=tournament, matchday__in=shown_matchdays)
-        .order_by("matchday", "kickoff", "home_team")
-    )
-
-    matches_by_md = {md: [] for md in shown_matchdays}
-    for m in matches:
-        matches_by_md[m.matchday].append(m)
-
-    match_ids = [m.id for m in matches]
-
-    all_preds = list(
-        Prediction.objects
-        .filter(group=group, match_id__in=match_ids, user__in=users)
-        .select_related("user", "match")
-    )
-    pred_map = {(p.user_id, p.match_id): p for p in all_preds}
+    # Σ = Tipp-Punkte (SQL-Aggregat) + Bonuspunkte (nur wenn reveal, sonst 0)
+    total_points_all = {
+        u.id: totals.get(u.id, 0) + bonus_points_by_user.get(u.id, 0)
+        for u in users
+    }
 
     # md_points[user_id][md] = int oder None (wenn an dem Spieltag noch keine Ergebnisse existieren)
-    md_points = {u.id: {md: None for md in shown_matchdays} for u in users}
-
-    for u in users:
-        for md in shown_matchdays:
-            md_matches = matches_by_md.get(md, [])
-            if not md_matches:
-                md_points[u.id][md] = None
-                continue
-
-            scored_any = False
-            total = 0
-
-            for m in md_matches:
-                if m.home_score is None or m.away_score is None:
-                    continue
-                scored_any = True
-                p = pred_map.get((u.id, m.id))
-                total += points_for_prediction(m, p)
-
-            md_points[u.id][md] = total if scored_any else None
+    md_points = {
+        u.id: {
+            md: (md_totals.get((u.id, md), 0) if md in scored_mds else None)
+            for md in shown_matchdays
+        }
+        for u in users
+    }
 
     # --- Ränge pro Spieltag -------------------------------------------------
     rank_by_md = {md: {} for md in shown_matchdays}
 
     for md in shown_matchdays:
-        any_results = any(
-            (m.home_score is not None and m.away_score is not None)
-            for m in matches_by_md.get(md, [])
-        )
-        if not any_results:
+        if md not in scored_mds:
             for u in users:
                 rank_by_md[md][u.id] = None
             continue
 
-        sortable = []
-        for u in users:
-            pts = md_points[u.id][md]
-            pts = pts if pts is not None else 0
-            sortable.append((pts, u.username.lower(), u.id))
+        # Wettkampf-Rang ("1224"): Rang = erste Position der Punktzahl in der absteigend sortierten Liste
+        pts_by_user = {u.id: md_points[u.id][md] or 0 for u in users}
+        first_pos = {}
+        for idx, pts in enumerate(sorted(pts_by_user.values(), reverse=True), start=1):
+            first_pos.setdefault(pts, idx)
 
-        sortable.sort(key=lambda x: (-x[0], x[1]))
-
-        rank = 0
-        last_pts = None
-        for idx, (pts, _name, uid) in enumerate(sortable, start=1):
-            if last_pts is None or pts != last_pts:
-                rank = idx
-                last_pts = pts
-            rank_by_md[md][uid] = rank
+        rank_by_md[md] = {uid: first_pos[pts] for uid, pts in pts_by_user.items()}
 
     # --- Platzierungsdifferenz (vs vorherige Spalte im Fenster) -------------
     rankdiff_by_md = {md: {} for md in shown_matchdays}
@@ -779,7 +1046,8 @@ def tabelle(request):
         })
 
     # Sortierung wie Kicktipp: Σ absteigend, dann Username
-    table_rows.sort(key=lambda r: (-r["total"], r["user"].username.lower()))
+    # (stabil, users kommen aus _group_users schon nach Username sortiert)
+    table_rows.sort(key=itemgetter("total"), reverse=True)
 
     return render(request, "tipping/tabelle.html", {
         "group": group,
@@ -812,7 +1080,7 @@ def join_group(request):
             group=group
         )
 
-        request.session["active_group_id"] = group.id
+        _set_active_group(request, group.id)
 
         messages.success(request, f"Beigetreten ✅ Gruppe: {group.name}")
         return redirect("tippen")
@@ -848,146 +1116,26 @@ def user_stats(request, user_id: int):
     tournament = group.tournament
 
     # Ziel-User muss Mitglied der aktiven Gruppe sein
-    target_user = get_object_or_404(
-        User,
-        id=user_id,
-        groupmembership__group=group,
-    )
-
-    # Nur Spiele mit Ergebnis (sonst kann man keine Punkte/Tabellen berechnen)
-    matches_with_result = Match.objects.filter(
-        tournament=tournament,
-        home_score__isnull=False,
-        away_score__isnull=False,
+    target_user = next((u for u in _group_users(request, group) if u.id == user_id), None)
+    if target_user is None:
+        raise Http404("User ist nicht Mitglied dieser Gruppe.")
+
+    # Cache-Key: Stand der Tipps dieses Users in der Gruppe + Stand der Spiele (Ergebnisse) im Turnier
+    key = (
+        f"user_stats:{group.id}:{target_user.id}"
+        f":{_state_stamp(Prediction.objects.filter(group=group, user=target_user))}"
+        f":{_state_stamp(Match.objects.filter(tournament=tournament))}"
     )
-
-    preds = (
-        Prediction.objects
-        .filter(group=group, user=target_user, match__in=matches_with_result)
-        .select_related("match")
+    stats = cache.get_or_set(
+        key,
+        lambda: _user_stats_payload(group, tournament, target_user),
+        USER_STATS_CACHE_TIMEOUT,
     )
 
-    tip_counts = Counter({"Heim": 0, "Remis": 0, "Gast": 0})
-    hit_counts = Counter({"Kein Treffer": 0, "Tendenz": 0, "Tordifferenz": 0, "Ergebnis": 0})
-    scoreline_counts = Counter()
-    team_points = defaultdict(int)
-
-    predicted_table = defaultdict(lambda: {
-        "played": 0,
-        "wins": 0,
-        "draws": 0,
-        "losses": 0,
-        "gf": 0,
-        "ga": 0,
-        "points": 0,
-    })
-
-    def points_from_pred(h: int, a: int):
-        if h > a:
-            return 3, 0
-        if h < a:
-            return 0, 3
-        return 1, 1
-
-    for p in preds:
-        m = p.match
-
-        # leere Tipps ignorieren
-        if p.pred_home is None or p.pred_away is None:
-            continue
-
-        # A) Heim/Remis/Gast
-        if p.pred_home > p.pred_away:
-            tip_counts["Heim"] += 1
-        elif p.pred_home < p.pred_away:
-            tip_counts["Gast"] += 1
-        else:
-            tip_counts["Remis"] += 1
-
-        # B) Trefferkategorie
-        pts = points_for_prediction(m, p)
-        if pts == 4:
-            hit_counts["Ergebnis"] += 1
-        elif pts == 3:
-            hit_counts["Tordifferenz"] += 1
-        elif pts == 2:
-            hit_counts["Tendenz"] += 1
-        else:
-            hit_counts["Kein Treffer"] += 1
-
-        # C) Scorelines
-        scoreline_counts[f"{p.pred_home}:{p.pred_away}"] += 1
-
-        # D) Team-Punkte
-        team_points[m.home_team] += pts
-        team_points[m.away_team] += pts
-
-        # E) Predicted League Table
-        home = m.home_team
-        away = m.away_team
-        ph = int(p.pred_home)
-        pa = int(p.pred_away)
-
-        predicted_table[home]["played"] += 1
-        predicted_table[away]["played"] += 1
-
-        predicted_table[home]["gf"] += ph
-        predicted_table[home]["ga"] += pa
-        predicted_table[away]["gf"] += pa
-        predicted_table[away]["ga"] += ph
-
-        hp, ap = points_from_pred(ph, pa)
-        predicted_table[home]["points"] += hp
-        predicted_table[away]["points"] += ap
-
-        if ph > pa:
-            predicted_table[home]["wins"] += 1
-            predicted_table[away]["losses"] += 1
-        elif ph < pa:
-            predicted_table[away]["wins"] += 1
-            predicted_table[home]["losses"] += 1
-        else:
-            predicted_table[home]["draws"] += 1
-            predicted_table[away]["draws"] += 1
-
-    top_scores = scoreline_counts.most_common(3)
-
-    team_points_items = list(team_points.items())
-    top_teams = sorted(team_points_items, key=lambda x: (-x[1], x[0].lower()))[:10]
-    bottom_teams = sorted(team_points_items, key=lambda x: (x[1], x[0].lower()))[:10]
-
-    predicted_table_rows = []
-    for team, st in predicted_table.items():
-        gd = st["gf"] - st["ga"]
-        predicted_table_rows.append({
-            "team": team,
-            "played": st["played"],
-            "wins": st["wins"],
-            "draws": st["draws"],
-            "losses": st["losses"],
-            "gf": st["gf"],
-            "ga": st["ga"],
-            "gd": gd,
-            "points": st["points"],
-        })
-
-    predicted_table_rows.sort(key=lambda r: (-r["points"], -r["gd"], -r["gf"], r["team"].lower()))
-    for i, r in enumerate(predicted_table_rows, start=1):
-        r["pos"] = i
-
     return render(request, "tipping/user_stats.html", {
         "group": group,
         "target_user": target_user,
-
-        "tip_counts": dict(tip_counts),
-        "hit_counts": dict(hit_counts),
-
-        "top_scores": top_scores,
-        "top_teams": top_teams,
-        "bottom_teams": bottom_teams,
-
-        "predicted_table_rows": predicted_table_rows,
-        "total_predictions": sum(tip_counts.values()),
+        **stats,
     })
 
 @login_required
@@ -999,13 +1147,12 @@ def create_group(request: HttpRequest):
                 with transaction.atomic():
                     group = form.save()
 
-                    GroupMembership.objects.create(
-                        user=request.user,
-                        group=group,
-                        is_creator=True,
-                    )
+                    # bulk_create: ein INSERT ohne save()-Signale/Model-Save-Logik
+                    GroupMembership.objects.bulk_create([
+                        GroupMembership(user=request.user, group=group, is_creator=True),
+                    ])
 
-                request.session["active_group_id"] = group.id
+                _set_active_group(request, group.id)
 
                 # Pro: Code sofort, aber nicht nur "einmalig"
                 messages.success(request, f"Gruppe erstellt ✅ Join-Code: {group.join_code}")
@@ -1025,6 +1172,8 @@ def create_group(request: HttpRequest):
 @require_POST
 def set_active_group(request: HttpRequest):
     group_id = request.POST.get("group_id")
+    # Ziel einmal bestimmen: zurück zur aufrufenden Seite, sonst Tippen
+    next_url = request.META.get("HTTP_REFERER") or reverse("tippen")
 
     membership = (
         GroupMembership.objects
@@ -1035,11 +1184,11 @@ def set_active_group(request: HttpRequest):
 
     if not membership:
         messages.error(request, "Du bist nicht Mitglied dieser Gruppe.")
-        return redirect(request.META.get("HTTP_REFERER", "tippen"))
+        return redirect(next_url)
 
-    request.session["active_group_id"] = membership.group_id
+    _set_active_group(request, membership.group_id)
     messages.success(request, f"Aktive Gruppe: {membership.group.name}")
-    return redirect(request.META.get("HTTP_REFERER", "tippen"))
+    return redirect(next_url)
 
 
 @login_required
@@ -1053,19 +1202,20 @@ def bonus_tips(request):
 
     # ✅ Locking nur, wenn season_start gesetzt ist
     season_start = tournament.season_start
-    if season_start and timezone.now() >= season_start:
+    if tournament.season_started():
         messages.error(request, "Bonustipps sind gesperrt.")
         return redirect("tippen")
 
     # ✅ existierende Bonustipps laden und als initial setzen
-    existing = BonusPrediction.objects.filter(
-        user=request.user,
-        group=group,
-        tournament=tournament
+    # nur (bonus_type, value) als Tupel, keine Model-Instanzen
+    initial = dict(
+        BonusPrediction.objects.filter(
+            user=request.user,
+            group=group,
+            tournament=tournament
+        ).values_list("bonus_type", "value")
     )
 
-    initial = {bp.bonus_type: bp.value for bp in existing}
-
     if request.method == "POST":
         form = BonusPredictionForm(
             request.POST,
@@ -1073,14 +1223,16 @@ def bonus_tips(request):
         )
 
         if form.is_valid():
-            for field, value in form.cleaned_data.items():
-                BonusPrediction.objects.update_or_create(
+            _upsert_bonus_predictions(request.user, group, [
+                BonusPrediction(
                     user=request.user,
                     group=group,
                     tournament=tournament,
                     bonus_type=field,
-                    defaults={"value": value},
+                    value=value,
                 )
+                for field, value in form.cleaned_data.items()
+            ])
 
             messages.success(request, "Bonustipps gespeichert.")
             return redirect("bonus_tips")
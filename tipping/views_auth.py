@@ -1,3 +1,4 @@
+from django import forms
 from django.contrib.auth import login
 from django.shortcuts import render, redirect
 
@@ -8,9 +9,13 @@ def signup(request):
     if request.method == "POST":
         form = SignupForm(request.POST)
         if form.is_valid():
-            user = form.save()
-            login(request, user)
-            return redirect("join_group")  # nach Registrierung direkt Gruppe beitreten
+            try:
+                user = form.save()
+            except forms.ValidationError:
+                pass  # E-Mail schon vergeben – Fehler hängt bereits am Formular
+            else:
+                login(request, user)
+                return redirect("join_group")  # nach Registrierung direkt Gruppe beitreten
     else:
         form = SignupForm()
 
@@ -92,12 +92,24 @@ WSGI_APPLICATION = "tippspiel.wsgi.application"
 # Railway provides DATABASE_URL (usually PostgreSQL). Local default: sqlite.
 DATABASE_URL = os.environ.get("DATABASE_URL", "").strip()
 
+# Persistente Verbindungen: DB_CONN_MAX_AGE=none hält sie unbegrenzt offen (z.B. hinter PgBouncer)
+db_conn_max_age_env = (os.environ.get("DB_CONN_MAX_AGE", "").strip() or "600").lower()
+DB_CONN_MAX_AGE = None if db_conn_max_age_env == "none" else int(db_conn_max_age_env)
+
+# PgBouncer im Transaction-Pooling: DB_PGBOUNCER=1 setzen. Server-side Cursors (QuerySet.iterator(),
+# z.B. in import_matches) überleben dort keinen Transaktionswechsel → laut Django-Doku abschalten.
+DB_PGBOUNCER = os.environ.get("DB_PGBOUNCER", "0") == "1"
+
 if DATABASE_URL:
     is_postgres = DATABASE_URL.startswith(("postgres://", "postgresql://"))
+    # URL ist oben schon gelesen -> direkt parsen statt config() (liest env erneut aus)
     DATABASES = {
-        "default": dj_database_url.config(
-            default=DATABASE_URL,
-            conn_max_age=600,
+        "default": dj_database_url.parse(
+            DATABASE_URL,
+            conn_max_age=DB_CONN_MAX_AGE,
+            # tote wiederverwendete Verbindungen zu Beginn des Requests erkennen statt 500
+            conn_health_checks=True,
+            disable_server_side_cursors=DB_PGBOUNCER,
             ssl_require=(is_postgres and (not DEBUG)),
         )
     }
@@ -110,6 +122,28 @@ else:
     }
 
 
+# ---------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------
+# In Railway: set REDIS_URL (shared cache for all gunicorn workers).
+# Local default: in-memory cache per process.
+REDIS_URL = os.environ.get("REDIS_URL", "").strip()
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
 
 # ---------------------------------------------------------------------
 # Password validation
@@ -137,18 +171,26 @@ USE_TZ = True
 # Static files
 # ---------------------------------------------------------------------
 
-STATIC_URL = "/static/"
+# Optional CDN vor WhiteNoise (Pull-Zone auf diese App), z.B. STATIC_HOST=https://cdn.example.com
+# Die Manifest-Hashes + WHITENOISE_MAX_AGE sorgen dafür, dass der CDN die Dateien dauerhaft cachen kann.
+STATIC_HOST = os.environ.get("STATIC_HOST", "").strip().rstrip("/")
+STATIC_URL = STATIC_HOST + "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]     # <— dein Quell-Ordner
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
 
 # WhiteNoise storage (recommended)
+# collectstatic schreibt .gz und – wenn das Paket "Brotli" installiert ist – auch .br Varianten
 STORAGES = {
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     }
 }
 
+# Gehashte Manifest-Dateien cached WhiteNoise ohnehin "forever"; das gilt dann auch für den Rest
+# (Templates verlinken nur über {% static %}, also immer auf die gehashten Namen)
+WHITENOISE_MAX_AGE = 0 if DEBUG else 31536000
+
 
 # ---------------------------------------------------------------------
 # Auth redirects
@@ -1,12 +1,10 @@
 from django.contrib import admin
 from django.urls import path, include
-from django.shortcuts import redirect
-
-def root_redirect(request):
-    return redirect("/accounts/login/")  # 🔥 hier zur Login-Seite
+from django.views.generic import RedirectView
 
 urlpatterns = [
-    path("", root_redirect, name="root"),   # ✅ Root abfangen
+    # ✅ Root abfangen → direkt zur Login-Seite (302, ohne eigene View-Funktion)
+    path("", RedirectView.as_view(url="/accounts/login/", permanent=False), name="root"),
     path("", include("tipping.urls")),      # deine App-Routen
     path("admin/", admin.site.urls),
-]
\ No newline at end of file
+]